@@ -1,16 +1,18 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from word_level_analyzer import load_word_levels, analyze_text
+from nltk.corpus import wordnet
+from word_level_analyzer import load_word_levels, build_synonym_index, analyze_text
 import uvicorn
 import os
 import sys
-import json
 from typing import List, Optional
 
 app = FastAPI(
     title="Word Level Analyzer API",
     description="API for analyzing English text and suggesting synonyms with CEFR levels",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Load word levels once when starting the service
@@ -19,6 +21,11 @@ try:
     if not word_levels:
         print("Error: No word levels loaded. Please check your CSV files.")
         sys.exit(1)
+    # Force the corpus into memory up front; synsets() would otherwise
+    # lazy-load it behind a lock on the first call
+    wordnet.ensure_loaded()
+    # Precompute the synonym table once so requests never hit WordNet directly
+    build_synonym_index(word_levels)
 except Exception as e:
     print(f"Error loading word levels: {str(e)}")
     sys.exit(1)
@@ -47,9 +54,8 @@ async def analyze_text_endpoint(request: TextRequest):
     - **min_synonym_level**: Minimum CEFR level for synonym suggestions (A2, B1, B2, C1)
     """
     try:
-        result_json = analyze_text(request.text, word_levels)
-        result_list = json.loads(result_json)
-        return [WordAnalysis(**item) for item in result_list]
+        # FastAPI validates against response_model and serializes once
+        return analyze_text(request.text, word_levels)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
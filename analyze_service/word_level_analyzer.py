@@ -1,9 +1,21 @@
-import json
+import os
 import re
 from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
 import nltk
+import pandas as pd
 from nltk.corpus import wordnet
 
+# Compiled once at import; \w must stay Unicode-aware because the word lists
+# contain accented entries (e.g. résumé in b2.csv)
+_WORD_RE = re.compile(r"\b\w+\b")
+
+# CEFR levels as ints: comparisons on the hot path become int compares instead
+# of relying on the lexical ordering of 'A1' < 'A2' < ... < 'C1'
+_LVL = {'A1': 0, 'A2': 1, 'B1': 2, 'B2': 3, 'C1': 4}
+_LVL_NAMES = ['A1', 'A2', 'B1', 'B2', 'C1']
+
 # Download required NLTK data
 try:
     nltk.data.find('corpora/wordnet')
@@ -12,66 +24,122 @@ except LookupError:
 
 def load_word_levels():
     """Load word levels from all CSV files"""
-    word_levels = {}
     csv_files = ['a1.csv', 'a2.csv', 'b1.csv', 'b2.csv', 'c1.csv']
+    frames = []
     for file_path in csv_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                next(f)
-                for line in f:
-                    word, level = line.strip().split('|')
-                    if word.lower() not in word_levels or level > word_levels[word.lower()]:
-                        word_levels[word.lower()] = level
-        except FileNotFoundError:
+        if not os.path.exists(file_path):
             print(f"Warning: {file_path} not found")
             continue
-    
-    return word_levels
+        # pandas' C parser handles line splitting and parsing in native code
+        frames.append(pd.read_csv(file_path, sep='|', header=0,
+                                  names=['word', 'level'], engine='c', dtype=str))
+    if not frames:
+        return {}
 
-def get_synonym_suggestions(word, word_levels, min_level='A2'):
-    """Get synonym suggestions using WordNet"""
+    df = pd.concat(frames, ignore_index=True)
+    df['word'] = df['word'].str.strip().str.lower()
+    # Some rows carry trailing whitespace in the level column, so strip first
+    df['level'] = df['level'].str.strip().map(_LVL)
+    # The files are concatenated in ascending CEFR order, so for a duplicated
+    # word the last occurrence is the highest level; a keep-last dedup gives
+    # the max without any per-word comparison
+    df = df.drop_duplicates('word', keep='last')
+    return dict(zip(df['word'], df['level']))
+
+@lru_cache(maxsize=100_000)
+def _cached_synsets(word):
+    """Look up WordNet synsets with caching, since repeated words are common across requests"""
+    return wordnet.synsets(word)
+
+# Precomputed word -> suggestions table, filled in by build_synonym_index at startup
+_synonym_index = None
+
+def _wordnet_suggestions(word, word_levels):
+    """Collect all leveled synonym suggestions for a word from WordNet.
+
+    Returns (level, suggestion_dict) pairs so callers can filter on the int
+    level without re-deriving it.
+    """
+    lowered = word.lower()
+    synsets = _cached_synsets(lowered)
+    if not synsets:
+        return []
+    definition = synsets[0].definition()
+    # Lemma names are lowercased once while building the set, and the source
+    # word drops out via a single set subtraction
+    all_synonyms = {
+        lemma.name().replace('_', ' ').lower()
+        for synset in synsets for lemma in synset.lemmas()
+    } - {lowered}
     suggestions = []
-    synsets = wordnet.synsets(word.lower())
-    all_synonyms = set()
-    for synset in synsets:
-        # Get lemmas (word forms) from the synset
-        for lemma in synset.lemmas():
-            # Get the word form and remove underscores
-            synonym = lemma.name().replace('_', ' ')
-            if synonym != word.lower():
-                all_synonyms.add(synonym)
     for synonym in all_synonyms:
-        level = word_levels.get(synonym.lower())
-        if level and level >= min_level:
-            suggestions.append({
+        level = word_levels.get(synonym)
+        if level is not None:
+            suggestions.append((level, {
                 "word": synonym,
-                "level": level,
-                "definition": synsets[0].definition() if synsets else ""
-            })
-    
+                "level": _LVL_NAMES[level],
+                "definition": definition
+            }))
+    suggestions.sort(key=lambda s: (s[0], s[1]["word"]))
     return suggestions
 
+def build_synonym_index(word_levels):
+    """Precompute synonym suggestions for every known word so requests become dict lookups.
+
+    The build is deliberately sequential: NLTK's corpus reader seeks and reads
+    on one shared file handle per POS, so concurrent synsets() calls corrupt
+    each other's reads.
+    """
+    global _synonym_index
+    index = {}
+    for word in word_levels:
+        suggestions = _wordnet_suggestions(word, word_levels)
+        if suggestions:
+            index[word] = suggestions
+    _synonym_index = index
+    return index
+
+def get_synonym_suggestions(word, word_levels, min_level='A2'):
+    """Get synonym suggestions using WordNet"""
+    if _synonym_index is not None:
+        suggestions = _synonym_index.get(word.lower(), [])
+    else:
+        suggestions = _wordnet_suggestions(word, word_levels)
+    min_lvl = _LVL[min_level]
+    return [data for level, data in suggestions if level >= min_lvl]
+
+def _suggestions_for_hit(word, level, count, word_levels):
+    """Return synonym suggestions for an analyzed word, or [] when it doesn't qualify"""
+    # C1 is the highest level we track, so a C1 word can't have a
+    # higher-level replacement; skip the lookup outright
+    if (level == _LVL['A1'] or count > 1) and level < _LVL['C1']:
+        return get_synonym_suggestions(word, word_levels)
+    return []
+
 def analyze_text(text, word_levels):
-    """Analyze text and return word levels in JSON format"""
-    words = re.findall(r'\b\w+\b', text.lower())
-    word_counts = Counter(words)
-    result = []
-    for word, count in word_counts.items():
-        level = word_levels.get(word)
-        if level is not None:
-            word_data = {
-                "word": word,
-                "level": level,
-                "count": count
-            }
-            if level == 'A1' or count > 1:
-                suggestions = get_synonym_suggestions(word, word_levels)
-                if suggestions:
-                    word_data["suggestions"] = suggestions
-            
-            result.append(word_data)
-    
-    # Sort by level and then by word
-    result.sort(key=lambda x: (x["level"], x["word"]))
-    
-    return json.dumps(result, indent=2)
\ No newline at end of file
+    """Analyze text and return a list of word-level dicts"""
+    # Stream matches instead of materializing a lowercased copy and a token
+    # list, and fold the word_levels membership check into the same pass so
+    # unknown tokens are never stored or counted
+    word_counts = Counter(w for m in _WORD_RE.finditer(text)
+                          if (w := m.group(0).lower()) in word_levels)
+    # Materialize the hits first, then assemble the result dicts in one
+    # comprehension; suggestions are attached only when the lookup yields any
+    hits = [(word, word_levels[word], count) for word, count in word_counts.items()]
+    result = [
+        {
+            "word": word,
+            "level": _LVL_NAMES[level],
+            "count": count,
+            **({"suggestions": suggestions}
+               if (suggestions := _suggestions_for_hit(word, level, count, word_levels))
+               else {})
+        }
+        for word, level, count in hits
+    ]
+
+
+    # Sort by level and then by word; itemgetter runs in C, unlike a lambda
+    result.sort(key=itemgetter("level", "word"))
+
+    return result
\ No newline at end of file
@@ -1,18 +1,9 @@
-import csv
-import json
+import pandas as pd
 
-def read_csv(file_path):
-    with open(file_path, mode='r', encoding='utf-8') as file:
-        reader = csv.reader(file)
-        next(reader)  # Skip header row
-        data = [row for row in reader]
-    return data
-
-def escape_sql_string(value):
-    """Properly escape single quotes for SQL by replacing ' with ''"""
-    if value.lower() == 'null':
-        return 'NULL'
-    return value.replace("'", "''")
+def sql_quote_column(series):
+    """Escape single quotes and wrap a string column in SQL quotes, mapping 'null' to NULL."""
+    quoted = "'" + series.str.replace("'", "''", regex=False) + "'"
+    return quoted.where(series.str.lower() != 'null', 'NULL')
 
 def replace_array(input_string):
   # Check if the string starts with '[' and ends with ']'
@@ -35,23 +26,21 @@ def replace_array(input_string):
 
 if __name__ == "__main__":
     file_path = './examples.csv'
-    data = read_csv(file_path)
-    output = ''
-    for row in data:
-        # Convert each value to have proper SQL escaping
-        values = []
-        for i, val in enumerate(row):
-            if i in [0, 3, 8]:  # Numeric fields (id, level, freq)
-                values.append(val if val.lower() != 'null' else 'NULL')
-            else:  # String fields that need quotes and escaping
-                if val.lower() == 'null':
-                    values.append('NULL')
-                else:
-                    values.append(f"'{escape_sql_string(val)}'")
-        
-        # Construct the SQL statement
-        output += f"INSERT INTO examples (id, title, meaning) VALUES ({values[0]}, {values[1]}, {values[2] if values[2] != 'NULL' else '\'\''});"
-        output += '\n'
-    
-    with open('./output.sql', 'w', encoding='utf-8') as file:
-        file.write(output)
\ No newline at end of file
+    with open('./output.sql', 'w', encoding='utf-8', buffering=1 << 20) as file:
+        # Chunked reads keep memory bounded by the chunk size and start
+        # emitting SQL before the whole CSV has been parsed; dtype=str +
+        # keep_default_na=False keeps every cell as the raw text, matching
+        # what csv.reader used to hand us
+        for df in pd.read_csv(file_path, dtype=str, keep_default_na=False,
+                              chunksize=10_000):
+            # Numeric id column passes through unquoted; title/meaning are
+            # escaped with vectorized string ops instead of a per-row loop
+            ids = df.iloc[:, 0].where(df.iloc[:, 0].str.lower() != 'null', 'NULL')
+            titles = sql_quote_column(df.iloc[:, 1])
+            meanings = sql_quote_column(df.iloc[:, 2])
+            meanings = meanings.where(meanings != 'NULL', "''")
+
+            statements = ("INSERT INTO examples (id, title, meaning) VALUES ("
+                          + ids + ", " + titles + ", " + meanings + ");")
+            file.write('\n'.join(statements))
+            file.write('\n')